@@ -1,24 +1,34 @@
+import asyncio
 import time
 import random
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 from actions import HumanAction
 from utils import rotate_user_agent, parse_proxy, spoof_fingerprint
 from profiles import ProfileManager
+from timeline import derive_instance_seed, TimelineDivergenceError
+
+# Seconds between JS heap samples while an instance dwells on the page
+JS_HEAP_SAMPLE_INTERVAL = 1.0
 
 class BrowserManager:
-    def __init__(self, profile_manager=None):
-        """Initialize browser manager with optional profile manager"""
+    def __init__(self, profile_manager=None, status_tracker=None, seed=None, timeline=None):
+        """Initialize browser manager with optional profile manager, status tracker, seed and timeline"""
         self.profile_manager = profile_manager or ProfileManager()
+        self.status_tracker = status_tracker
+        self.seed = seed
+        self.timeline = timeline
+        self.playwright = None
+        self.browser = None
         self.active_browsers = {}
 
-    def _setup_playwright_browser(self, profile_id, proxy=None):
-        """Setup Playwright browser with anti-detection measures"""
+    async def start(self):
+        """Start the shared Playwright driver and browser with anti-detection measures"""
+        if self.browser:
+            return
+
         try:
-            playwright = sync_playwright().start()
-            
-            # Get or create profile
-            profile = self.profile_manager.get_profile(profile_id)
-            
+            self.playwright = await async_playwright().start()
+
             # Browser launch options
             browser_options = {
                 'headless': True,  # Run in headless mode since we're in a web environment
@@ -30,86 +40,184 @@ class BrowserManager:
                 ]
             }
 
-            # Add proxy if provided
+            # Launch the one browser every instance opens its context in
+            self.browser = await self.playwright.chromium.launch(**browser_options)
+
+        except Exception as e:
+            await self.close()
+            raise Exception(f"Failed to start Playwright browser: {str(e)}")
+
+    async def close(self):
+        """Close all instances, the shared browser and the Playwright driver"""
+        await self.close_all_browsers()
+        try:
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            print(f"Failed to close Playwright browser: {str(e)}")
+        finally:
+            self.browser = None
+            self.playwright = None
+
+    def _instance_rng(self, instance_id):
+        """Create the RNG that drives every random decision of one instance"""
+        if self.timeline:
+            return self.timeline.rng_for(instance_id)
+        return random.Random(derive_instance_seed(self.seed, instance_id))
+
+    def _set_state(self, instance_id, state, error=None):
+        """Report an instance state change to the status tracker, if any"""
+        if self.status_tracker:
+            self.status_tracker.set_state(instance_id, state, error)
+
+    async def _sample_js_heap(self, instance_id, page):
+        """Report the page's JS heap usage, read over CDP, to the status tracker"""
+        if not self.status_tracker:
+            return
+        try:
+            browser_context = self.active_browsers[instance_id]
+            cdp_session = browser_context.get('cdp_session')
+            if cdp_session is None:
+                # CDP metrics are exact, unlike the bucketed performance.memory
+                cdp_session = await browser_context['context'].new_cdp_session(page)
+                await cdp_session.send('Performance.enable')
+                browser_context['cdp_session'] = cdp_session
+
+            metrics = (await cdp_session.send('Performance.getMetrics'))['metrics']
+            js_heap_bytes = next(
+                int(metric['value']) for metric in metrics if metric['name'] == 'JSHeapUsedSize'
+            )
+            self.status_tracker.record_js_heap(instance_id, js_heap_bytes)
+        except Exception:
+            # Sampling is best-effort and must never fail the instance
+            pass
+
+    async def _dwell(self, instance_id, page, duration):
+        """Stay on the page for the given duration, sampling the JS heap periodically"""
+        end_time = time.time() + duration
+        while True:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            await self._sample_js_heap(instance_id, page)
+            await asyncio.sleep(min(JS_HEAP_SAMPLE_INTERVAL, remaining))
+
+    async def _setup_browser_context(self, profile_id, proxy=None, rng=None):
+        """Open an isolated context for a profile in the shared browser"""
+        try:
+            if not self.browser:
+                raise RuntimeError("Browser manager has not been started")
+
+            # Get or create profile
+            profile = self.profile_manager.get_profile(profile_id)
+
+            # Create context with specific device profile
+            context_options = {
+                'user_agent': rotate_user_agent(rng),
+                'viewport': profile['settings']['viewport'],
+                'locale': profile['settings']['language'],
+                'timezone_id': profile['settings']['timezone'],
+                'geolocation': profile['settings']['geolocation'],
+            }
+
+            # Add proxy if provided; contexts carry their own proxy in the shared browser
             if proxy:
                 proxy_config = parse_proxy(proxy)
                 if proxy_config:
-                    browser_options['proxy'] = {
+                    context_options['proxy'] = {
                         'server': proxy_config['server'],
                         'username': proxy_config['username'],
                         'password': proxy_config['password']
                     }
 
-            # Launch browser
-            browser = playwright.chromium.launch(**browser_options)
-            
-            # Create context with specific device profile
-            context = browser.new_context(
-                user_agent=rotate_user_agent(),
-                viewport=profile['settings']['viewport'],
-                locale=profile['settings']['language'],
-                timezone_id=profile['settings']['timezone'],
-                geolocation=profile['settings']['geolocation'],
-            )
+            context = await self.browser.new_context(**context_options)
 
             # Load cookies if available
             if profile['cookies']:
-                context.add_cookies(profile['cookies'])
+                await context.add_cookies(profile['cookies'])
 
-            return playwright, browser, context
+            return context
 
+        except TimelineDivergenceError:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to setup Playwright browser: {str(e)}")
+            raise Exception(f"Failed to setup browser context: {str(e)}")
 
-    def launch_browser_instance(self, instance_id, url, proxy=None, min_time=5, max_time=15, log_callback=None):
+    async def launch_browser_instance(self, instance_id, url, proxy=None, min_time=5, max_time=15, log_callback=None):
         """Launch a browser instance with specified parameters"""
+        on_page_since = None
         try:
             profile_id = f"profile_{instance_id}"
-            
-            # Setup browser
-            playwright, browser, context = self._setup_playwright_browser(profile_id, proxy)
-            page = context.new_page()
-            
+            rng = self._instance_rng(instance_id)
+            self._set_state(instance_id, 'launching')
+
+            # Setup browser context
+            context = await self._setup_browser_context(profile_id, proxy, rng)
+            page = await context.new_page()
+
             browser_context = {
-                'playwright': playwright,
-                'browser': browser,
                 'context': context,
-                'page': page
+                'page': page,
+                'rng': rng
             }
 
             # Store browser context
             self.active_browsers[instance_id] = browser_context
 
             # Navigate to URL
-            page.goto(url)
+            self._set_state(instance_id, 'navigating')
+            await page.goto(url)
+            on_page_since = time.time()
             if log_callback:
                 log_callback(f"Instance {instance_id}: Navigated to {url}")
 
             # Take screenshot for verification
             screenshot_path = f"instance_{instance_id}_screenshot.png"
-            page.screenshot(path=screenshot_path)
+            await page.screenshot(path=screenshot_path)
             if log_callback:
                 log_callback(f"Instance {instance_id}: Screenshot saved to {screenshot_path}")
 
             # Simulate human behavior
-            self._simulate_human_behavior(instance_id)
+            self._set_state(instance_id, 'dwelling')
+            await self._sample_js_heap(instance_id, page)
+            await self._simulate_human_behavior(instance_id)
 
             # Random close time
-            close_time = random.uniform(min_time, max_time)
-            time.sleep(close_time)
+            close_time = rng.uniform(min_time, max_time)
+            await self._dwell(instance_id, page, close_time)
+
+            # Close browser context
+            time_on_page = time.time() - on_page_since
+            self._set_state(instance_id, 'closing')
+            await self.close_browser_instance(instance_id)
+
+            # A replay must consume exactly the draws that were recorded
+            if self.timeline:
+                rng.finish()
+            self._set_state(instance_id, 'finished')
+            if log_callback:
+                log_callback(f"Instance {instance_id}: Closed after {time_on_page:.1f} seconds")
 
-            # Close browser
-            self.close_browser_instance(instance_id)
+        except asyncio.CancelledError:
+            # Stopped from outside, possibly in the middle of goto or a screenshot
+            time_on_page = time.time() - on_page_since if on_page_since else 0.0
+            self._set_state(instance_id, 'closing')
+            await self.close_browser_instance(instance_id)
+            self._set_state(instance_id, 'finished')
             if log_callback:
-                log_callback(f"Instance {instance_id}: Closed after {close_time:.1f} seconds")
+                log_callback(f"Instance {instance_id}: Stopped early, closed after {time_on_page:.1f} seconds on page")
+            raise
 
         except Exception as e:
             if log_callback:
                 log_callback(f"Instance {instance_id} failed: {str(e)}")
-            self.close_browser_instance(instance_id)
+            await self.close_browser_instance(instance_id)
+            self._set_state(instance_id, 'failed', str(e))
             raise
 
-    def _simulate_human_behavior(self, instance_id):
+    async def _simulate_human_behavior(self, instance_id):
         """Simulate random human-like behavior in the browser"""
         try:
             browser_context = self.active_browsers.get(instance_id)
@@ -117,51 +225,49 @@ class BrowserManager:
                 return
 
             page = browser_context['page']
-            actions = HumanAction()
-            
+            rng = browser_context['rng']
+            actions = HumanAction(rng)
+
             # Simulate scrolling
-            actions.simulate_scroll(
+            await actions.simulate_scroll(
                 page,
-                direction=random.choice(['up', 'down']),
-                amount=random.randint(300, 1000)
+                direction=rng.choice(['up', 'down']),
+                amount=rng.randint(300, 1000)
             )
-            
+
             # Random mouse movements
-            actions.simulate_random_movement(page)
-            
+            await actions.simulate_random_movement(page)
+
             # Random clicks (if needed)
-            if random.random() < 0.3:  # 30% chance
-                actions.simulate_click(page)
+            if rng.random() < 0.3:  # 30% chance
+                await actions.simulate_click(page)
 
+        except TimelineDivergenceError:
+            raise
         except Exception as e:
             print(f"Failed to simulate human behavior: {str(e)}")
 
-    def close_browser_instance(self, instance_id):
+    async def close_browser_instance(self, instance_id):
         """Close a specific browser instance"""
-        try:
-            browser_context = self.active_browsers.get(instance_id)
-            if not browser_context:
-                return
+        browser_context = self.active_browsers.pop(instance_id, None)
+        if not browser_context:
+            return
 
+        try:
             # Save cookies before closing
             if self.profile_manager:
-                cookies = browser_context['context'].cookies()
+                cookies = await browser_context['context'].cookies()
                 self.profile_manager.update_cookies(f"profile_{instance_id}", cookies)
-            
-            # Close Playwright browser
-            browser_context['page'].close()
-            browser_context['context'].close()
-            browser_context['browser'].close()
-            browser_context['playwright'].stop()
 
-            # Remove from active browsers
-            del self.active_browsers[instance_id]
+            # Close the instance's context; the shared browser stays up
+            await browser_context['page'].close()
+            await browser_context['context'].close()
 
         except Exception as e:
             print(f"Failed to close browser instance {instance_id}: {str(e)}")
 
-    def close_all_browsers(self):
+    async def close_all_browsers(self):
         """Close all active browser instances"""
         instance_ids = list(self.active_browsers.keys())
         for instance_id in instance_ids:
-            self.close_browser_instance(instance_id)
\ No newline at end of file
+            await self.close_browser_instance(instance_id)
@@ -1,20 +1,47 @@
 import sys
+import asyncio
 import argparse
 from browser_manager import BrowserManager
 from profiles import ProfileManager
-from utils import validate_inputs
+from status_server import StatusTracker, StatusServer
+from timeline import ActionTimeline
+from utils import validate_inputs, MAX_INSTANCES
 
 def log_callback(message):
     """Print log messages to console"""
     print(message)
 
+async def run_instances(browser_manager, args):
+    """Run the requested instances one after another on one shared browser"""
+    await browser_manager.start()
+    try:
+        for i in range(args.instances):
+            instance_id = i + 1
+            print(f"\nLaunching instance {instance_id}...")
+
+            await browser_manager.launch_browser_instance(
+                instance_id,
+                args.url,
+                args.proxy,
+                args.min_time,
+                args.max_time,
+                log_callback
+            )
+    finally:
+        await browser_manager.close()
+
 def main():
     parser = argparse.ArgumentParser(description='Anti-Detect Browser Automation CLI')
     parser.add_argument('url', help='URL to visit')
     parser.add_argument('--proxy', help='Proxy in format IP:PORT:USER:PASS (optional)', default='')
-    parser.add_argument('--instances', type=int, help='Number of browser instances (1-10)', default=1)
+    parser.add_argument('--instances', type=int, help=f'Number of browser instances (1-{MAX_INSTANCES})', default=1)
     parser.add_argument('--min-time', type=int, help='Minimum time in seconds (5-300)', default=5)
     parser.add_argument('--max-time', type=int, help='Maximum time in seconds (5-300)', default=15)
+    parser.add_argument('--status-port', type=int, help='Serve live JSON status on localhost at this port (optional)', default=None)
+    parser.add_argument('--seed', help='Seed for per-instance random behavior (optional)', default=None)
+    timeline_group = parser.add_mutually_exclusive_group()
+    timeline_group.add_argument('--record-timeline', metavar='PATH', help='Record every action draw to a timeline file (optional)')
+    timeline_group.add_argument('--replay-timeline', metavar='PATH', help='Replay a previously recorded timeline file (optional)')
     
     args = parser.parse_args()
 
@@ -31,29 +58,65 @@ def main():
         print(f"Error: {error_message}")
         sys.exit(1)
 
+    timeline = None
+    if args.record_timeline:
+        timeline = ActionTimeline(args.seed)
+    elif args.replay_timeline:
+        if args.seed is not None:
+            print("Error: --seed cannot be used with --replay-timeline; the recording fixes every draw")
+            sys.exit(1)
+        try:
+            timeline = ActionTimeline.load(args.replay_timeline)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+
+        expected_ids = [str(i + 1) for i in range(args.instances)]
+        if timeline.instance_ids != expected_ids:
+            print(
+                f"Error: Timeline records instances {', '.join(timeline.instance_ids)} "
+                f"but --instances {args.instances} would run {', '.join(expected_ids)}"
+            )
+            sys.exit(1)
+
     print("Starting browser automation...")
-    browser_manager = BrowserManager(ProfileManager())
+    status_tracker = None
+    status_server = None
+    if args.status_port is not None:
+        status_tracker = StatusTracker()
+        for i in range(args.instances):
+            status_tracker.set_state(i + 1, 'queued')
+        status_server = StatusServer(status_tracker, port=args.status_port)
+        try:
+            status_server.start()
+        except RuntimeError as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+        print(f"Live status available at {status_server.url}")
+
+    browser_manager = BrowserManager(ProfileManager(), status_tracker, args.seed, timeline)
+    timeline_failed = False
 
     try:
-        for i in range(args.instances):
-            instance_id = i + 1
-            print(f"\nLaunching instance {instance_id}...")
-            
-            browser_manager.launch_browser_instance(
-                instance_id,
-                args.url,
-                args.proxy,
-                args.min_time,
-                args.max_time,
-                log_callback
-            )
+        asyncio.run(run_instances(browser_manager, args))
 
     except KeyboardInterrupt:
         print("\nStopping automation...")
-        browser_manager.close_all_browsers()
     except Exception as e:
         print(f"\nError: {str(e)}")
-        browser_manager.close_all_browsers()
+        sys.exit(1)
+    finally:
+        if status_server:
+            status_server.stop()
+        if args.record_timeline:
+            try:
+                timeline.save(args.record_timeline)
+                print(f"Timeline recorded to {args.record_timeline}")
+            except RuntimeError as e:
+                print(f"Error: {str(e)}")
+                timeline_failed = True
+
+    if timeline_failed:
         sys.exit(1)
 
     print("\nAutomation completed successfully!")
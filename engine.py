@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from browser_manager import BrowserManager
+from profiles import ProfileManager
+
+# Contexts open at once in the shared browser; later jobs wait for a free slot
+MAX_CONCURRENT_CONTEXTS = 10
+
+class AutomationEngine:
+    def __init__(self, browser_manager=None, max_concurrent=MAX_CONCURRENT_CONTEXTS):
+        """Initialize a long-lived engine around one shared browser manager"""
+        self.browser_manager = browser_manager or BrowserManager(ProfileManager())
+        self.max_concurrent = max_concurrent
+        self._loop = asyncio.new_event_loop()
+        self._thread = None
+        self._tasks = set()
+        self._slots = None
+        self._start_lock = None
+        self._drain_task = None
+        self._stopping = False
+        self._stopped_callback = None
+
+    def start(self):
+        """Start the engine's event loop in a background thread"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name='automation-engine', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Run the event loop that drives every browser instance"""
+        asyncio.set_event_loop(self._loop)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._start_lock = asyncio.Lock()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+            if self._stopped_callback:
+                self._stopped_callback()
+
+    def submit(self, instance_id, url, proxy=None, min_time=5, max_time=15,
+               log_callback=None, error_callback=None, finished_callback=None):
+        """Queue a browser instance job; callbacks are invoked from the engine thread"""
+        if self._stopping:
+            raise RuntimeError("Engine is shutting down")
+
+        if self.browser_manager.status_tracker:
+            self.browser_manager.status_tracker.set_state(instance_id, 'queued')
+
+        job = {
+            'instance_id': instance_id,
+            'url': url,
+            'proxy': proxy,
+            'min_time': min_time,
+            'max_time': max_time,
+            'log_callback': log_callback,
+            'error_callback': error_callback,
+            'finished_callback': finished_callback
+        }
+        self._loop.call_soon_threadsafe(self._spawn, job)
+
+    def _spawn(self, job):
+        """Schedule a job on the engine loop and keep track of it until it ends"""
+        task = self._loop.create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, job):
+        """Run a single browser instance job and report back through its callbacks"""
+        instance_id = job['instance_id']
+        try:
+            async with self._slots:
+                # The shared driver and browser start with the first job
+                async with self._start_lock:
+                    await self.browser_manager.start()
+
+                await self.browser_manager.launch_browser_instance(
+                    instance_id,
+                    job['url'],
+                    job['proxy'],
+                    job['min_time'],
+                    job['max_time'],
+                    job['log_callback']
+                )
+        except Exception as e:
+            if job['error_callback']:
+                job['error_callback'](f"Instance {instance_id} error: {str(e)}")
+        finally:
+            if job['finished_callback']:
+                job['finished_callback']()
+
+    def _begin_drain(self):
+        """Schedule the shutdown sequence on the engine loop"""
+        self._drain_task = self._loop.create_task(self._drain())
+
+    async def _drain(self):
+        """Cancel every job, close the shared browser and stop the loop"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            await self.browser_manager.close()
+        finally:
+            self._loop.stop()
+
+    def shutdown(self, wait=True, stopped_callback=None):
+        """Cancel all jobs and stop the engine; stopped_callback fires from its thread once closed"""
+        if self._stopping:
+            return
+        self._stopping = True
+
+        if not self._thread:
+            if stopped_callback:
+                stopped_callback()
+            return
+
+        self._stopped_callback = stopped_callback
+        self._loop.call_soon_threadsafe(self._begin_drain)
+        if wait:
+            self._thread.join()
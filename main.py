@@ -3,49 +3,35 @@ import threading
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QSpinBox, QPushButton, 
                             QTextEdit, QMessageBox, QProgressBar, QStatusBar)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
-from browser_manager import BrowserManager
-from utils import validate_inputs
-from profiles import ProfileManager
+from engine import AutomationEngine
+from utils import validate_inputs, MAX_INSTANCES
 
-class BrowserWorker(QThread):
-    """Worker thread for browser automation"""
+class EngineSignals(QObject):
+    """Bridge engine callbacks from background threads to the Qt event loop"""
     log_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
     finished_signal = pyqtSignal()
-
-    def __init__(self, instance_id, url, proxy, min_time, max_time):
-        super().__init__()
-        self.instance_id = instance_id
-        self.url = url
-        self.proxy = proxy
-        self.min_time = min_time
-        self.max_time = max_time
-        self.browser_manager = BrowserManager(ProfileManager())
-
-    def run(self):
-        try:
-            self.browser_manager.launch_browser_instance(
-                self.instance_id,
-                self.url,
-                self.proxy,
-                self.min_time,
-                self.max_time,
-                self.log_signal.emit
-            )
-        except Exception as e:
-            self.error_signal.emit(f"Instance {self.instance_id} error: {str(e)}")
-        finally:
-            self.finished_signal.emit()
+    stopped_signal = pyqtSignal()
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.init_ui()
-        self.workers = []
         self.active_instances = 0
 
+        # One shared engine serves every instance for the window's lifetime
+        self.engine = AutomationEngine()
+        self.engine.start()
+        self.engine_signals = EngineSignals()
+        self.engine_signals.log_signal.connect(self.log_message)
+        self.engine_signals.error_signal.connect(self.show_error)
+        self.engine_signals.finished_signal.connect(self.update_progress)
+        self.engine_signals.stopped_signal.connect(self.engine_stopped)
+        self.stopping = False
+        self.engine_has_stopped = False
+
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle('Anti-Detect Browser Automation')
@@ -83,7 +69,7 @@ class MainWindow(QMainWindow):
         instance_label = QLabel('Instances:')
         instance_label.setMinimumWidth(100)
         self.instance_count = QSpinBox()
-        self.instance_count.setRange(1, 10)
+        self.instance_count.setRange(1, MAX_INSTANCES)
         self.instance_count.setValue(1)
         instance_layout.addWidget(instance_label)
         instance_layout.addWidget(self.instance_count)
@@ -226,19 +212,26 @@ class MainWindow(QMainWindow):
         self.log_area.clear()
         self.log_message("Starting automation...")
 
-        # Launch browser instances
+        # Hand browser instances to the shared engine
         for i in range(instance_count):
-            worker = BrowserWorker(i + 1, url, proxy, min_time, max_time)
-            worker.log_signal.connect(self.log_message)
-            worker.error_signal.connect(self.show_error)
-            worker.finished_signal.connect(self.update_progress)
-            self.workers.append(worker)
-            worker.start()
+            self.engine.submit(
+                i + 1,
+                url,
+                proxy,
+                min_time,
+                max_time,
+                self.engine_signals.log_signal.emit,
+                self.engine_signals.error_signal.emit,
+                self.engine_signals.finished_signal.emit
+            )
 
         self.status_bar.showMessage('Automation in progress...')
 
     def automation_finished(self):
         """Clean up after automation is finished"""
+        if self.stopping:
+            return
+
         # Re-enable inputs
         self.start_button.setEnabled(True)
         self.url_input.setEnabled(True)
@@ -247,9 +240,6 @@ class MainWindow(QMainWindow):
         self.min_time.setEnabled(True)
         self.max_time.setEnabled(True)
 
-        # Clear workers
-        self.workers.clear()
-
         # Update UI
         self.progress_bar.setVisible(False)
         self.status_bar.showMessage('Automation completed')
@@ -257,13 +247,24 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle application closure"""
-        # Stop all running instances
-        for worker in self.workers:
-            if worker.isRunning():
-                worker.browser_manager.close_all_browsers()
-                worker.terminate()
-                worker.wait()
-        event.accept()
+        if self.engine_has_stopped:
+            event.accept()
+            return
+
+        # Keep the window open, and the event loop responsive, until the engine has drained
+        event.ignore()
+        if self.stopping:
+            return
+        self.stopping = True
+        self.start_button.setEnabled(False)
+        self.status_bar.showMessage('Stopping browser instances...')
+        self.log_message("Stopping all instances before closing...")
+        self.engine.shutdown(wait=False, stopped_callback=self.engine_signals.stopped_signal.emit)
+
+    def engine_stopped(self):
+        """Finish closing once the engine has closed every instance"""
+        self.engine_has_stopped = True
+        self.close()
 
 def main():
     app = QApplication(sys.argv)
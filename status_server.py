@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Lifecycle states an instance moves through, in order
+INSTANCE_STATES = ['queued', 'launching', 'navigating', 'dwelling', 'closing', 'finished', 'failed']
+ACTIVE_STATES = ['launching', 'navigating', 'dwelling', 'closing']
+
+class StatusTracker:
+    def __init__(self):
+        """Initialize a thread-safe registry of instance states"""
+        self._lock = threading.Lock()
+        self._instances = {}
+        self._started_at = time.time()
+
+    def set_state(self, instance_id, state, error=None):
+        """Move an instance into a new lifecycle state"""
+        if state not in INSTANCE_STATES:
+            raise ValueError(f"Unknown instance state: {state}")
+
+        with self._lock:
+            instance = self._instances.setdefault(instance_id, {
+                'state': None,
+                'phase_started_at': None,
+                'js_heap_bytes': None,
+                'js_heap_sampled_at': None,
+                'error': None
+            })
+            instance['state'] = state
+            instance['phase_started_at'] = time.time()
+            if error is not None:
+                instance['error'] = error
+
+    def record_js_heap(self, instance_id, js_heap_bytes):
+        """Store the latest JS heap sample for an instance"""
+        with self._lock:
+            instance = self._instances.get(instance_id)
+            if instance is None:
+                return
+            instance['js_heap_bytes'] = js_heap_bytes
+            instance['js_heap_sampled_at'] = time.time()
+
+    def snapshot(self):
+        """Return a JSON-serializable view of all instances and aggregate counters"""
+        now = time.time()
+        with self._lock:
+            instances = {}
+            counters = {state: 0 for state in INSTANCE_STATES}
+            total_js_heap = 0
+
+            for instance_id, instance in self._instances.items():
+                counters[instance['state']] += 1
+                if instance['state'] in ACTIVE_STATES and instance['js_heap_bytes']:
+                    total_js_heap += instance['js_heap_bytes']
+
+                instances[str(instance_id)] = {
+                    'state': instance['state'],
+                    'phase_duration': round(now - instance['phase_started_at'], 3),
+                    'js_heap_bytes': instance['js_heap_bytes'],
+                    'js_heap_sampled_at': instance['js_heap_sampled_at'],
+                    'error': instance['error']
+                }
+
+        return {
+            'uptime': round(now - self._started_at, 3),
+            'instances': instances,
+            'counters': {
+                'total': len(instances),
+                'active': sum(counters[state] for state in ACTIVE_STATES),
+                'states': counters,
+                'active_js_heap_bytes': total_js_heap
+            }
+        }
+
+class _StatusRequestHandler(BaseHTTPRequestHandler):
+    """Serve tracker snapshots as JSON"""
+
+    def do_GET(self):
+        snapshot = self.server.tracker.snapshot()
+        path = self.path.split('?', 1)[0].rstrip('/')
+
+        if path in ('', '/status'):
+            self._send_json(200, snapshot)
+        elif path == '/instances':
+            self._send_json(200, snapshot['instances'])
+        elif path == '/counters':
+            self._send_json(200, snapshot['counters'])
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep request logs out of the automation output
+        pass
+
+class StatusServer:
+    def __init__(self, tracker, host='127.0.0.1', port=8765):
+        """Initialize a live-status HTTP server for the given tracker"""
+        self.tracker = tracker
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL the server is reachable at"""
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """Start serving status requests from a background thread"""
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _StatusRequestHandler)
+        except (OSError, OverflowError) as e:
+            raise RuntimeError(f"Failed to start status server on {self.host}:{self.port}: {str(e)}")
+
+        self._server.daemon_threads = True
+        self._server.tracker = self.tracker
+        # Pick up the real port when 0 was requested
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name='status-server', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the server and wait for its thread to exit"""
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
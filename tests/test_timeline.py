@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from timeline import (ActionTimeline, RecordingRandom, ReplayRandom,
+                      TimelineDivergenceError, derive_instance_seed)
+
+def draw_workload(rng):
+    """Make the same kinds of draws an instance makes during a run"""
+    return [
+        rng.choice(['up', 'down']),
+        rng.randint(300, 1000),
+        rng.uniform(0.1, 0.5),
+        rng.random()
+    ]
+
+def test_same_seed_records_same_draws():
+    first = RecordingRandom(derive_instance_seed(7, 1))
+    second = RecordingRandom(derive_instance_seed(7, 1))
+    assert draw_workload(first) == draw_workload(second)
+    assert first.events == second.events
+
+def test_instances_get_independent_seeds():
+    assert derive_instance_seed(7, 1) != derive_instance_seed(7, 2)
+    assert derive_instance_seed(None, 1) is None
+
+def test_replay_round_trip(tmp_path):
+    path = tmp_path / 'timeline.json'
+    recording = ActionTimeline(seed=3)
+    recorded = {instance_id: draw_workload(recording.rng_for(instance_id)) for instance_id in (1, 2)}
+    recording.save(path)
+
+    replay = ActionTimeline.load(path)
+    assert replay.instance_ids == ['1', '2']
+    for instance_id, values in recorded.items():
+        rng = replay.rng_for(instance_id)
+        assert draw_workload(rng) == values
+        rng.finish()
+
+def test_replay_rejects_different_method():
+    rng = ReplayRandom([['randint', [1, 6], 4]])
+    with pytest.raises(TimelineDivergenceError, match='recorded randint'):
+        rng.random()
+
+def test_replay_rejects_different_arguments():
+    rng = ReplayRandom([['uniform', [5, 15], 9.5]])
+    with pytest.raises(TimelineDivergenceError, match=r'replaying uniform\(5, 20\)'):
+        rng.uniform(5, 20)
+
+def test_replay_rejects_different_choices():
+    rng = ReplayRandom([['choice', [['up', 'down']], 'up']])
+    with pytest.raises(TimelineDivergenceError):
+        rng.choice(['left', 'right'])
+
+def test_replay_rejects_exhausted_timeline():
+    rng = ReplayRandom([['random', [], 0.5]])
+    rng.random()
+    with pytest.raises(TimelineDivergenceError, match='exhausted'):
+        rng.random()
+
+def test_finish_rejects_unused_draws():
+    rng = ReplayRandom([['random', [], 0.5], ['randint', [1, 6], 2]])
+    rng.random()
+    with pytest.raises(TimelineDivergenceError, match='1 of 2'):
+        rng.finish()
+
+def test_replay_rejects_unknown_instance(tmp_path):
+    path = tmp_path / 'timeline.json'
+    ActionTimeline(seed=1).save(path)
+    with pytest.raises(ValueError, match='no recording'):
+        ActionTimeline.load(path).rng_for(1)
+
+@pytest.mark.parametrize('content', [
+    'not json',
+    '[]',
+    '{"seed": 1}',
+    '{"instances": [1]}',
+    '{"instances": {"1": "draws"}}',
+    '{"instances": {"1": [["random", 0.5]]}}'
+])
+def test_load_rejects_malformed_files(tmp_path, content):
+    path = tmp_path / 'timeline.json'
+    path.write_text(content)
+    with pytest.raises(ValueError, match='Invalid timeline file'):
+        ActionTimeline.load(path)
+
+def test_load_rejects_missing_file(tmp_path):
+    with pytest.raises(ValueError, match='Invalid timeline file'):
+        ActionTimeline.load(tmp_path / 'missing.json')
+
+def test_saved_file_is_json(tmp_path):
+    path = tmp_path / 'timeline.json'
+    timeline = ActionTimeline(seed='abc')
+    timeline.rng_for(1).randint(1, 6)
+    timeline.save(path)
+    data = json.loads(path.read_text())
+    assert data['seed'] == 'abc'
+    assert data['instances']['1'][0][:2] == ['randint', [1, 6]]
@@ -0,0 +1,141 @@
+import json
+import random
+import threading
+from pathlib import Path
+
+def derive_instance_seed(seed, instance_id):
+    """Derive a stable per-instance seed from a run seed (None stays unseeded)"""
+    if seed is None:
+        return None
+    return f"{seed}:{instance_id}"
+
+class TimelineDivergenceError(RuntimeError):
+    """Raised when a replayed run stops matching its recorded timeline"""
+
+class RecordingRandom:
+    """Per-instance RNG that records every draw it makes"""
+
+    def __init__(self, seed=None):
+        self._rng = random.Random(seed)
+        self.events = []
+
+    def _record(self, method, args, value):
+        self.events.append([method, args, value])
+        return value
+
+    def random(self):
+        return self._record('random', [], self._rng.random())
+
+    def uniform(self, a, b):
+        return self._record('uniform', [a, b], self._rng.uniform(a, b))
+
+    def randint(self, a, b):
+        return self._record('randint', [a, b], self._rng.randint(a, b))
+
+    def choice(self, seq):
+        return self._record('choice', [list(seq)], self._rng.choice(seq))
+
+    def finish(self):
+        """Nothing to verify while recording"""
+
+class ReplayRandom:
+    """Per-instance RNG that hands back previously recorded draws in order"""
+
+    def __init__(self, events):
+        self._events = list(events)
+        self._position = 0
+
+    def _next(self, method, args):
+        if self._position >= len(self._events):
+            raise TimelineDivergenceError(
+                f"Timeline exhausted after {self._position} draws, replaying {method}{tuple(args)}"
+            )
+
+        recorded_method, recorded_args, value = self._events[self._position]
+        if recorded_method != method or recorded_args != args:
+            raise TimelineDivergenceError(
+                f"Timeline diverged at draw {self._position}: "
+                f"recorded {recorded_method}{tuple(recorded_args)}, replaying {method}{tuple(args)}"
+            )
+        self._position += 1
+        return value
+
+    def random(self):
+        return self._next('random', [])
+
+    def uniform(self, a, b):
+        return self._next('uniform', [a, b])
+
+    def randint(self, a, b):
+        return self._next('randint', [a, b])
+
+    def choice(self, seq):
+        return self._next('choice', [list(seq)])
+
+    def finish(self):
+        """Fail if the replayed run left recorded draws unused"""
+        unused = len(self._events) - self._position
+        if unused:
+            raise TimelineDivergenceError(
+                f"Timeline diverged: {unused} of {len(self._events)} recorded draws were not replayed"
+            )
+
+class ActionTimeline:
+    def __init__(self, seed=None, instances=None, mode='record'):
+        """Initialize an action timeline in record or replay mode"""
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown timeline mode: {mode}")
+
+        self.seed = seed
+        self.mode = mode
+        self._instances = {str(k): v for k, v in (instances or {}).items()}
+        self._recorders = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a recorded timeline from a JSON file for replay"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not isinstance(data.get('instances'), dict):
+                raise ValueError("expected an object with an 'instances' mapping")
+            for instance_id, events in data['instances'].items():
+                if not isinstance(events, list) or any(
+                    not isinstance(event, list) or len(event) != 3 for event in events
+                ):
+                    raise ValueError(f"malformed draws recorded for instance {instance_id}")
+            return cls(data.get('seed'), data['instances'], mode='replay')
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Invalid timeline file {path}: {str(e)}")
+
+    @property
+    def instance_ids(self):
+        """Instance ids that have a recording, as strings"""
+        with self._lock:
+            return sorted(self._instances, key=lambda key: (len(key), key))
+
+    def rng_for(self, instance_id):
+        """Return the recording or replaying RNG for an instance"""
+        key = str(instance_id)
+        with self._lock:
+            if self.mode == 'replay':
+                if key not in self._instances:
+                    raise ValueError(f"Timeline has no recording for instance {instance_id}")
+                return ReplayRandom(self._instances[key])
+
+            recorder = RecordingRandom(derive_instance_seed(self.seed, instance_id))
+            self._recorders[key] = recorder
+            return recorder
+
+    def save(self, path):
+        """Save all recorded instance timelines to a JSON file"""
+        with self._lock:
+            instances = dict(self._instances)
+            for key, recorder in self._recorders.items():
+                instances[key] = list(recorder.events)
+
+        try:
+            Path(path).write_text(json.dumps({'seed': self.seed, 'instances': instances}, indent=4))
+        except Exception as e:
+            raise RuntimeError(f"Failed to save timeline: {str(e)}")
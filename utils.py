@@ -2,6 +2,10 @@ import re
 import random
 from urllib.parse import urlparse
 
+# Maximum number of browser instances per run; they share one browser, where
+# engine.MAX_CONCURRENT_CONTEXTS bounds how many are open at once
+MAX_INSTANCES = 50
+
 # List of modern user agents for rotation
 USER_AGENTS = [
     # Windows Chrome
@@ -16,9 +20,9 @@ USER_AGENTS = [
     "Mozilla/5.0 (Linux; Android 14; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.144 Mobile Safari/537.36"
 ]
 
-def rotate_user_agent():
+def rotate_user_agent(rng=None):
     """Return a random user agent from the predefined list."""
-    return random.choice(USER_AGENTS)
+    return (rng or random).choice(USER_AGENTS)
 
 def parse_proxy(proxy_string):
     """
@@ -81,8 +85,8 @@ def validate_inputs(url, proxy, instance_count, min_time, max_time):
             return False, str(e)
 
     # Validate instance count
-    if not isinstance(instance_count, int) or not 1 <= instance_count <= 10:
-        return False, "Instance count must be between 1 and 10"
+    if not isinstance(instance_count, int) or not 1 <= instance_count <= MAX_INSTANCES:
+        return False, f"Instance count must be between 1 and {MAX_INSTANCES}"
 
     # Validate time range
     try: